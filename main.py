@@ -7,6 +7,9 @@ A Streamlit application that analyzes sentiment and generates aligned text
 import streamlit as st
 from sentiment import SentimentAnalyzer
 from text_generator import TextGenerator
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 import time
 
 # Page configuration
@@ -57,9 +60,10 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Initialize session state
+# Initialize session state; bounded so long sessions don't accumulate
+# every prior prompt/generation in memory
 if 'history' not in st.session_state:
-    st.session_state.history = []
+    st.session_state.history = deque(maxlen=50)
 
 @st.cache_resource
 def load_models():
@@ -106,7 +110,7 @@ with st.sidebar:
         clear_history = st.button("Clear History", type="secondary")
         
         if clear_history:
-            st.session_state.history = []
+            st.session_state.history.clear()
             st.success("History cleared!")
     
     st.divider()
@@ -159,27 +163,33 @@ if generate_btn:
             progress_bar.progress(33)
             
             if generation_mode == "Automatic Sentiment":
-                sentiment = sentiment_analyzer.detect_sentiment(prompt)
+                # Overlap sentiment detection with warming the generator's
+                # tokenizer on the prompt; torch releases the GIL inside
+                # the transformer forward, so the two genuinely run in
+                # parallel
+                with ThreadPoolExecutor(max_workers=2) as executor:
+                    sentiment_future = executor.submit(
+                        sentiment_analyzer.detect_sentiment, prompt
+                    )
+                    executor.submit(text_generator.tokenizer, prompt)
+                    sentiment = sentiment_future.result()
                 if show_scores:
+                    # Served from the analyzer's cache of the call above
                     scores = sentiment_analyzer.get_sentiment_scores(prompt)
             else:
                 sentiment = manual_sentiment
-            
-            time.sleep(0.5)  # Brief pause for UI feedback
-            
+
             # Step 2: Text Generation
             status_text.text("Generating text...")
             progress_bar.progress(66)
             
             generated = text_generator.generate_text(prompt, sentiment)
-            
-            time.sleep(0.5)
-            
+
             # Step 3: Complete
             status_text.text("Complete!")
             progress_bar.progress(100)
-            time.sleep(0.5)
-            
+
+
             # Clear progress indicators
             progress_bar.empty()
             status_text.empty()
@@ -214,13 +224,16 @@ if generate_btn:
                 'timestamp': time.strftime("%Y-%m-%d %H:%M:%S")
             })
 
-# History section
-with col2:
+# History section; a fragment so interactions inside the panel (expander
+# toggles) rerun only this function instead of the whole script
+@st.fragment
+def render_history():
     st.subheader("📚 Generation History")
-    
+
     if st.session_state.history:
-        # Display history in reverse order (newest first)
-        for idx, item in enumerate(reversed(st.session_state.history[-5:])):  # Show last 5
+        # Display history in reverse order (newest first), without
+        # materializing intermediate lists
+        for idx, item in enumerate(islice(reversed(st.session_state.history), 5)):  # Show last 5
             with st.expander(f"🕐 {item['timestamp']}", expanded=idx==0):
                 st.write(f"**Prompt:** {item['prompt'][:100]}...")
                 st.write(f"**Sentiment:** {item['sentiment'].capitalize()}")
@@ -228,6 +241,9 @@ with col2:
     else:
         st.info("No generation history yet. Start by entering a prompt!")
 
+with col2:
+    render_history()
+
 # Footer
 st.divider()
 st.markdown("""
@@ -4,17 +4,94 @@ Sentiment Analysis Module
 Uses Hugging Face transformers for sentiment analysis
 """
 
-from transformers import pipeline
+import functools
+import os
+import tempfile
+
+from transformers import AutoTokenizer, pipeline
+
+# Default model used by the "sentiment-analysis" pipeline task
+MODEL_NAME = "distilbert-base-uncased-finetuned-sst-2-english"
 
 class SentimentAnalyzer:
     """
     Analyzes sentiment of input text using Hugging Face transformers
     Returns: 'positive', 'negative', or 'neutral'
     """
-    
+
     def __init__(self):
-        """Initialize the sentiment analysis pipeline"""
-        self._pipeline = pipeline("sentiment-analysis")
+        """Initialize the sentiment analysis pipeline
+
+        Prefers a dynamically int8-quantized ONNX Runtime export of the
+        model (much faster on CPU); falls back to the standard PyTorch
+        pipeline if optimum/onnxruntime are unavailable.
+        """
+        try:
+            self._pipeline = self._load_quantized_pipeline()
+        except Exception as e:
+            print(f"ONNX Runtime unavailable, using default pipeline: {e}")
+            self._pipeline = pipeline("sentiment-analysis")
+        # Bound per-instance cache so repeated prompts (e.g. Streamlit
+        # reruns) skip the transformer forward pass entirely
+        self._classify = functools.lru_cache(maxsize=256)(self._run_pipeline)
+        # Fast path for the common detect_sentiment -> get_sentiment_scores
+        # sequence on the same prompt (show_scores enabled)
+        self._last_text = None
+        self._last_result = None
+
+    def _run_pipeline(self, text):
+        """Run the underlying pipeline on normalized text (uncached).
+
+        Input is truncated to 128 tokens: sentiment signal saturates well
+        below that, and it bounds latency on long pastes.
+        """
+        return self._pipeline(text, truncation=True, max_length=128)[0]
+
+    @staticmethod
+    def _cache_key(text):
+        """Normalize text into a cache key, collapsing trivial variants."""
+        return text.strip().lower()[:512]
+
+    @staticmethod
+    def _load_quantized_pipeline():
+        """
+        Export the sentiment model to ONNX, apply dynamic int8
+        quantization, and wrap it in a standard pipeline.
+
+        Returns:
+            Pipeline: A sentiment-analysis pipeline backed by ONNX Runtime
+        """
+        from optimum.onnxruntime import (
+            ORTModelForSequenceClassification,
+            ORTQuantizer,
+        )
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+        quantized_dir = os.path.join(
+            tempfile.gettempdir(), "sentiment_onnx_int8"
+        )
+
+        if not os.path.isdir(quantized_dir):
+            # One-time export + quantization, cached on disk afterwards
+            model = ORTModelForSequenceClassification.from_pretrained(
+                MODEL_NAME,
+                export=True,
+                provider="CPUExecutionProvider"
+            )
+            quantizer = ORTQuantizer.from_pretrained(model)
+            quantizer.quantize(
+                save_dir=quantized_dir,
+                quantization_config=AutoQuantizationConfig.avx512_vnni(
+                    is_static=False
+                )
+            )
+
+        model = ORTModelForSequenceClassification.from_pretrained(
+            quantized_dir,
+            provider="CPUExecutionProvider"
+        )
+        tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        return pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
     
     def detect_sentiment(self, text):
         """
@@ -29,7 +106,12 @@ class SentimentAnalyzer:
         if not text or not text.strip():
             return "neutral"
         
-        result = self._pipeline(text)[0]
+        if text == self._last_text:
+            result = self._last_result
+        else:
+            result = self._classify(self._cache_key(text))
+            self._last_text = text
+            self._last_result = result
         label = result.get("label", "").lower()
         
         if "pos" in label:
@@ -50,5 +132,11 @@ class SentimentAnalyzer:
         """
         if not text or not text.strip():
             return {"label": "neutral", "score": 0.0}
-        
-        return self._pipeline(text)[0]
\ No newline at end of file
+
+        if text == self._last_text:
+            return self._last_result
+
+        result = self._classify(self._cache_key(text))
+        self._last_text = text
+        self._last_result = result
+        return result
\ No newline at end of file